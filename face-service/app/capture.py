@@ -0,0 +1,170 @@
+import base64
+import json
+import logging
+import queue
+import struct
+import threading
+import time
+from dataclasses import dataclass
+from typing import BinaryIO, Iterator, Optional
+
+from .config import settings
+
+logger = logging.getLogger(__name__)
+
+# Record layout: 4-byte big-endian header length, JSON header, raw image bytes
+_HEADER_LEN = struct.Struct(">I")
+
+# Requests waiting for the writer thread before new ones are dropped
+_QUEUE_SIZE = 256
+
+
+@dataclass
+class CapturedRequest:
+    timestamp: float
+    endpoint: str
+    camera_id: Optional[str]
+    priority: str
+    image: bytes
+
+    @property
+    def image_base64(self) -> str:
+        return base64.b64encode(self.image).decode("ascii")
+
+
+class TrafficRecorder:
+    """Appends incoming image requests to a capture log for offline replay.
+
+    Disabled unless FACE_CAPTURE_PATH is set. Captures contain raw frames, so
+    only enable it on test or staging deployments. Requests are handed to a
+    background writer thread; if it falls behind, records are dropped and
+    counted rather than stalling the event loop.
+    """
+
+    def __init__(self):
+        self._queue: "queue.Queue[Optional[tuple]]" = queue.Queue(
+            maxsize=_QUEUE_SIZE
+        )
+        self._writer: Optional[threading.Thread] = None
+        self.recorded = 0
+        self.dropped = 0
+
+    @property
+    def enabled(self) -> bool:
+        return settings.capture_path is not None
+
+    def start(self):
+        if not self.enabled or self._writer is not None:
+            return
+        capture_file = open(settings.capture_path, "ab")
+        self._writer = threading.Thread(
+            target=self._write_loop,
+            args=(capture_file,),
+            name="capture-writer",
+            daemon=True,
+        )
+        self._writer.start()
+        logger.warning(f"Capturing incoming frames to {settings.capture_path}")
+
+    def close(self):
+        if self._writer is None:
+            return
+        self._queue.put(None)
+        self._writer.join()
+        self._writer = None
+        if self.dropped:
+            logger.warning(f"Capture dropped {self.dropped} requests (writer behind)")
+
+    def record(
+        self,
+        endpoint: str,
+        image_base64: str,
+        camera_id: Optional[str] = None,
+        priority: str = "live",
+    ):
+        if self._writer is None:
+            return
+        try:
+            self._queue.put_nowait(
+                (time.time(), endpoint, camera_id, priority, image_base64)
+            )
+        except queue.Full:
+            self.dropped += 1
+
+    def _write_loop(self, capture_file: BinaryIO):
+        with capture_file:
+            while True:
+                item = self._queue.get()
+                if item is None:
+                    return
+                self._write(capture_file, *item)
+                if self._queue.empty():
+                    capture_file.flush()
+
+    def _write(
+        self,
+        capture_file: BinaryIO,
+        timestamp: float,
+        endpoint: str,
+        camera_id: Optional[str],
+        priority: str,
+        image_base64: str,
+    ):
+        if "," in image_base64:
+            image_base64 = image_base64.split(",")[1]
+        try:
+            image = base64.b64decode(image_base64)
+        except ValueError:
+            return
+
+        header = json.dumps(
+            {
+                "t": timestamp,
+                "endpoint": endpoint,
+                "camera_id": camera_id,
+                "priority": priority,
+                "size": len(image),
+            },
+            separators=(",", ":"),
+        ).encode("utf-8")
+
+        capture_file.write(_HEADER_LEN.pack(len(header)))
+        capture_file.write(header)
+        capture_file.write(image)
+        self.recorded += 1
+
+
+def read_capture(path: str) -> Iterator[CapturedRequest]:
+    """Yield the requests stored in a capture log, in recorded order."""
+    with open(path, "rb") as f:
+        while True:
+            prefix = f.read(_HEADER_LEN.size)
+            if len(prefix) < _HEADER_LEN.size:
+                if prefix:
+                    logger.warning("Truncated record at end of capture, stopping")
+                return
+            (length,) = _HEADER_LEN.unpack(prefix)
+            header_bytes = f.read(length)
+            try:
+                if len(header_bytes) < length:
+                    raise ValueError("short header")
+                header = json.loads(header_bytes)
+                size = header["size"]
+                image = f.read(size)
+                if len(image) < size:
+                    raise ValueError("short image")
+                record = CapturedRequest(
+                    timestamp=header["t"],
+                    endpoint=header["endpoint"],
+                    camera_id=header.get("camera_id"),
+                    priority=header.get("priority", "live"),
+                    image=image,
+                )
+            except (ValueError, KeyError, TypeError):
+                # Writer killed mid-record (SIGKILL, OOM, stop timeout)
+                logger.warning("Truncated record at end of capture, stopping")
+                return
+            yield record
+
+
+recorder = TrafficRecorder()
@@ -0,0 +1,82 @@
+import asyncio
+import hashlib
+import logging
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Hashable
+
+from .config import settings
+from .face_processor import FaceProcessor
+
+logger = logging.getLogger(__name__)
+
+
+def image_key(image_base64: str) -> str:
+    """Digest of the decoded image bytes, so encoding differences still match."""
+    try:
+        image_bytes = FaceProcessor._image_bytes(image_base64)
+    except Exception as e:
+        raise ValueError(f"Invalid image data: {e}")
+    return hashlib.blake2b(image_bytes, digest_size=16).hexdigest()
+
+
+@dataclass
+class _InFlight:
+    task: asyncio.Future
+    waiters: int = 0
+
+
+class RequestCoalescer:
+    """Single-flight deduplication of identical in-flight requests.
+
+    While a request is being processed, identical ones attach to its future
+    instead of running inference again. Nothing is kept once it completes,
+    so this only collapses concurrent duplicates (retry storms), not repeats.
+    The shared work is cancelled once every caller waiting on it has gone.
+    """
+
+    def __init__(self):
+        self._inflight: dict[Hashable, _InFlight] = {}
+        self.leaders = 0
+        self.coalesced = 0
+
+    async def run(self, key: Hashable, factory: Callable[[], Awaitable[Any]]) -> Any:
+        if not settings.coalesce_requests:
+            return await factory()
+
+        entry = self._inflight.get(key)
+        if entry is not None:
+            self.coalesced += 1
+        else:
+            entry = _InFlight(task=asyncio.ensure_future(factory()))
+            self._inflight[key] = entry
+            self.leaders += 1
+            entry.task.add_done_callback(lambda t: self._release(key, entry, t))
+
+        entry.waiters += 1
+        try:
+            # Shielded so one caller leaving does not cancel the others
+            return await asyncio.shield(entry.task)
+        finally:
+            entry.waiters -= 1
+            if entry.waiters == 0 and not entry.task.done():
+                # Last caller gone: stop new callers attaching, drop the work
+                if self._inflight.get(key) is entry:
+                    del self._inflight[key]
+                entry.task.cancel()
+
+    def _release(self, key: Hashable, entry: _InFlight, task: asyncio.Future):
+        if self._inflight.get(key) is entry:
+            del self._inflight[key]
+        if not task.cancelled() and task.exception() is not None:
+            logger.debug(f"Coalesced request failed: {task.exception()}")
+
+    def status(self) -> dict:
+        return {
+            "enabled": settings.coalesce_requests,
+            "in_flight": len(self._inflight),
+            "leaders": self.leaders,
+            "coalesced": self.coalesced,
+        }
+
+
+coalescer = RequestCoalescer()
@@ -1,3 +1,5 @@
+from typing import Optional
+
 from pydantic_settings import BaseSettings
 
 
@@ -6,6 +8,43 @@ class Settings(BaseSettings):
     model_name: str = "buffalo_l"
     detection_threshold: float = 0.5
     embedding_size: int = 512
+    det_size: int = 640
+
+    # Decode-time downscaling for camera frames: largest IMREAD_REDUCED_* factor
+    # (1, 2, 4 or 8) allowed while keeping the region at least det_size wide.
+    max_decode_reduction: int = 8
+    # Cap for /detect-and-embed: embeddings are cropped from the decoded image,
+    # so reducing it shrinks faces before ArcFace. Raise only for close cameras.
+    embed_max_decode_reduction: int = 1
+
+    # Per-camera regions of interest, in fractions of the frame (0.0 - 1.0).
+    # Either a rectangle [x1, y1, x2, y2] or a polygon [[x, y], [x, y], ...].
+    # e.g. FACE_CAMERA_ROIS='{"door-cam-01": [0.2, 0.3, 0.8, 1.0]}'
+    camera_rois: dict[str, list[float] | list[list[float]]] = {}
+
+    # Request scheduler: total inference workers, then per-lane concurrency
+    # caps for live frames, interactive enrollment and batch jobs.
+    scheduler_workers: int = 2
+    live_lane_concurrency: int = 2
+    interactive_lane_concurrency: int = 1
+    batch_lane_concurrency: int = 1
+    # Workers only live frames may use; must be lower than scheduler_workers
+    live_reserved_workers: int = 1
+    lane_queue_limit: int = 64
+    # Live frames still queued after this long are dropped, not processed
+    live_deadline_ms: int = 1500
+
+    # Attach identical concurrent requests to the one already in flight
+    coalesce_requests: bool = True
+
+    # /compact-templates limits: embeddings accepted per customer, and
+    # held-out probes used for the recall estimate (each re-runs compaction)
+    compaction_max_embeddings_per_customer: int = 500
+    compaction_max_probes: int = 32
+
+    # Append incoming image requests to this file for offline replay (see
+    # app/replay.py). Stores raw frames: test/staging deployments only.
+    capture_path: Optional[str] = None
 
     class Config:
         env_prefix = "FACE_"
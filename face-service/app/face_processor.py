@@ -1,5 +1,6 @@
 import base64
 import logging
+from dataclasses import dataclass
 from typing import Optional
 
 import cv2
@@ -10,6 +11,103 @@ from .config import settings
 
 logger = logging.getLogger(__name__)
 
+# IMREAD_REDUCED_* flags: the JPEG decoder skips DCT detail instead of
+# decoding full size and resizing afterwards.
+_REDUCED_DECODE_FLAGS = {
+    1: cv2.IMREAD_COLOR,
+    2: cv2.IMREAD_REDUCED_COLOR_2,
+    4: cv2.IMREAD_REDUCED_COLOR_4,
+    8: cv2.IMREAD_REDUCED_COLOR_8,
+}
+
+# Start-of-frame markers that carry the image size (DHT, JPG and DAC excluded)
+_JPEG_SOF_MARKERS = set(range(0xC0, 0xD0)) - {0xC4, 0xC8, 0xCC}
+
+
+@dataclass
+class FrameTransform:
+    """Maps coordinates in a reduced/cropped frame back to the original frame."""
+
+    scale: float = 1.0
+    offset_x: float = 0.0
+    offset_y: float = 0.0
+
+    def map_bbox(self, bbox: list[float]) -> list[float]:
+        x1, y1, x2, y2 = bbox
+        return [
+            x1 * self.scale + self.offset_x,
+            y1 * self.scale + self.offset_y,
+            x2 * self.scale + self.offset_x,
+            y2 * self.scale + self.offset_y,
+        ]
+
+    def map_points(self, points: list[list[float]]) -> list[list[float]]:
+        return [
+            [x * self.scale + self.offset_x, y * self.scale + self.offset_y]
+            for x, y in points
+        ]
+
+
+def jpeg_size(data: bytes) -> Optional[tuple[int, int]]:
+    """Read (width, height) from the JPEG header without decoding pixels."""
+    if data[:2] != b"\xff\xd8":
+        return None
+
+    i = 2
+    while i + 9 <= len(data):
+        if data[i] != 0xFF:
+            return None
+        marker = data[i + 1]
+        if marker == 0xFF:
+            i += 1
+            continue
+        if marker in _JPEG_SOF_MARKERS:
+            height = int.from_bytes(data[i + 5:i + 7], "big")
+            width = int.from_bytes(data[i + 7:i + 9], "big")
+            return width, height
+        if marker == 0x01 or 0xD0 <= marker <= 0xD7:
+            i += 2
+            continue
+        i += 2 + int.from_bytes(data[i + 2:i + 4], "big")
+
+    return None
+
+
+def roi_geometry(
+    roi: list,
+) -> tuple[tuple[float, float, float, float], Optional[list[list[float]]]]:
+    """Split a configured ROI into its bounding rectangle and optional polygon.
+
+    Coordinates are fractions of the frame; a flat [x1, y1, x2, y2] list is a
+    rectangle, a list of [x, y] points is a polygon.
+    """
+    if roi and isinstance(roi[0], (list, tuple)):
+        if len(roi) < 3:
+            raise ValueError("ROI polygon needs at least 3 points")
+        polygon = [
+            [min(max(float(x), 0.0), 1.0), min(max(float(y), 0.0), 1.0)]
+            for x, y in roi
+        ]
+        xs = [p[0] for p in polygon]
+        ys = [p[1] for p in polygon]
+        # Shoelace area catches collinear points inside a non-empty bounding box
+        area = 0.5 * abs(
+            sum(
+                xs[i] * ys[i - 1] - xs[i - 1] * ys[i]
+                for i in range(len(polygon))
+            )
+        )
+        if max(xs) <= min(xs) or max(ys) <= min(ys) or area == 0:
+            raise ValueError("ROI polygon is empty")
+        return (min(xs), min(ys), max(xs), max(ys)), polygon
+
+    if len(roi) != 4:
+        raise ValueError("ROI rectangle must be [x1, y1, x2, y2]")
+    x1, y1, x2, y2 = (min(max(float(v), 0.0), 1.0) for v in roi)
+    if x2 <= x1 or y2 <= y1:
+        raise ValueError("ROI rectangle is empty")
+    return (x1, y1, x2, y2), None
+
 
 class FaceProcessor:
     def __init__(self):
@@ -21,12 +119,20 @@ class FaceProcessor:
         if self._initialized:
             return
 
+        for camera_id, roi in settings.camera_rois.items():
+            try:
+                roi_geometry(roi)
+            except (TypeError, ValueError) as e:
+                raise ValueError(f"Invalid ROI for camera {camera_id}: {e}")
+
         logger.info(f"Loading face analysis model: {settings.model_name}")
         self.model = FaceAnalysis(
             name=settings.model_name,
             providers=["CPUExecutionProvider"],
         )
-        self.model.prepare(ctx_id=-1, det_size=(640, 640))
+        self.model.prepare(
+            ctx_id=-1, det_size=(settings.det_size, settings.det_size)
+        )
         self._initialized = True
         logger.info("Face analysis model loaded successfully")
 
@@ -34,12 +140,15 @@ class FaceProcessor:
     def is_loaded(self) -> bool:
         return self._initialized and self.model is not None
 
+    @staticmethod
+    def _image_bytes(image_base64: str) -> bytes:
+        if "," in image_base64:
+            image_base64 = image_base64.split(",")[1]
+        return base64.b64decode(image_base64)
+
     def decode_image(self, image_base64: str) -> np.ndarray:
         try:
-            if "," in image_base64:
-                image_base64 = image_base64.split(",")[1]
-
-            image_bytes = base64.b64decode(image_base64)
+            image_bytes = self._image_bytes(image_base64)
             nparr = np.frombuffer(image_bytes, np.uint8)
             image = cv2.imdecode(nparr, cv2.IMREAD_COLOR)
 
@@ -51,7 +160,79 @@ class FaceProcessor:
             logger.error(f"Image decode error: {e}")
             raise ValueError(f"Invalid image data: {e}")
 
-    def detect_faces(self, image: np.ndarray) -> list[dict]:
+    @staticmethod
+    def reduction_factor(longest_side: float, max_reduction: int) -> int:
+        """Largest decode reduction that still feeds the detector at full det_size."""
+        for factor in (8, 4, 2):
+            if factor > max_reduction:
+                continue
+            if longest_side / factor >= settings.det_size:
+                return factor
+        return 1
+
+    def decode_frame(
+        self,
+        image_base64: str,
+        camera_id: Optional[str] = None,
+        max_reduction: Optional[int] = None,
+    ) -> tuple[np.ndarray, FrameTransform]:
+        """Decode a camera frame at reduced resolution, cropped to the camera ROI.
+
+        Returns the image to run detection on and the transform that maps its
+        coordinates back to the original frame. ``max_reduction`` defaults to
+        settings.max_decode_reduction; embedding callers pass a lower cap since
+        ArcFace crops are taken from this same (reduced) image.
+        """
+        if max_reduction is None:
+            max_reduction = settings.max_decode_reduction
+
+        roi = settings.camera_rois.get(camera_id) if camera_id else None
+        rect, polygon = roi_geometry(roi) if roi else ((0.0, 0.0, 1.0, 1.0), None)
+
+        try:
+            image_bytes = self._image_bytes(image_base64)
+
+            factor = 1
+            size = jpeg_size(image_bytes)
+            if size is not None:
+                width, height = size
+                factor = self.reduction_factor(
+                    max((rect[2] - rect[0]) * width, (rect[3] - rect[1]) * height),
+                    max_reduction,
+                )
+
+            nparr = np.frombuffer(image_bytes, np.uint8)
+            image = cv2.imdecode(nparr, _REDUCED_DECODE_FLAGS[factor])
+
+            if image is None:
+                raise ValueError("Failed to decode image")
+        except Exception as e:
+            logger.error(f"Image decode error: {e}")
+            raise ValueError(f"Invalid image data: {e}")
+
+        if roi is None:
+            return image, FrameTransform(scale=float(factor))
+
+        dec_h, dec_w = image.shape[:2]
+        x1, y1 = int(rect[0] * dec_w), int(rect[1] * dec_h)
+        x2, y2 = int(np.ceil(rect[2] * dec_w)), int(np.ceil(rect[3] * dec_h))
+        crop = image[y1:y2, x1:x2]
+
+        if polygon is not None:
+            points = np.array(
+                [[x * dec_w - x1, y * dec_h - y1] for x, y in polygon], dtype=np.int32
+            )
+            mask = np.zeros(crop.shape[:2], dtype=np.uint8)
+            cv2.fillPoly(mask, [points], 255)
+            crop = cv2.bitwise_and(crop, crop, mask=mask)
+
+        return crop, FrameTransform(
+            scale=float(factor), offset_x=x1 * factor, offset_y=y1 * factor
+        )
+
+    def detect_faces(
+        self, image: np.ndarray, transform: Optional[FrameTransform] = None
+    ) -> list[dict]:
         if not self.is_loaded:
             raise RuntimeError("Face model not initialized")
 
@@ -64,6 +245,9 @@ class FaceProcessor:
 
             bbox = face.bbox.tolist()
             landmarks = face.kps.tolist() if face.kps is not None else []
+            if transform is not None:
+                bbox = transform.map_bbox(bbox)
+                landmarks = transform.map_points(landmarks)
 
             results.append(
                 {
@@ -92,11 +276,14 @@ class FaceProcessor:
         embedding = face.embedding.tolist()
         return embedding
 
-    def detect_and_embed(self, image: np.ndarray) -> list[dict]:
+    def detect_and_embed(
+        self, image: np.ndarray, transform: Optional[FrameTransform] = None
+    ) -> list[dict]:
         """Detect all faces and extract embeddings in a single model.get() call.
 
         This avoids the overhead of calling model.get() twice (once for detection,
         once for embedding) which was the main performance bottleneck.
+        Bboxes are mapped back to original frame coordinates via ``transform``.
         """
         if not self.is_loaded:
             raise RuntimeError("Face model not initialized")
@@ -110,8 +297,12 @@ class FaceProcessor:
             if face.embedding is None:
                 continue
 
+            bbox = face.bbox.tolist()
+            if transform is not None:
+                bbox = transform.map_bbox(bbox)
+
             results.append({
-                "bbox": face.bbox.tolist(),
+                "bbox": bbox,
                 "confidence": float(face.det_score),
                 "embedding": face.embedding.tolist(),
             })
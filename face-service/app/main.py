@@ -4,8 +4,12 @@ from contextlib import asynccontextmanager
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 
+from .capture import recorder
+from .coalescer import coalescer, image_key
 from .config import settings
 from .face_processor import face_processor
+from .scheduler import scheduler
+from .template_compaction import check_gallery_size, compact_gallery
 from .models import (
     DetectFacesRequest,
     DetectFacesResponse,
@@ -17,7 +21,10 @@ from .models import (
     FaceWithEmbedding,
     MatchRequest,
     MatchResponse,
+    CompactTemplatesRequest,
+    CompactTemplatesResponse,
     HealthResponse,
+    StatusResponse,
 )
 
 logging.basicConfig(level=logging.INFO)
@@ -28,8 +35,12 @@ logger = logging.getLogger(__name__)
 async def lifespan(app: FastAPI):
     logger.info("Starting Face Service...")
     face_processor.initialize()
+    scheduler.start()
+    recorder.start()
     yield
     logger.info("Shutting down Face Service...")
+    recorder.close()
+    scheduler.shutdown()
 
 
 app = FastAPI(
@@ -57,11 +68,32 @@ async def health_check():
     )
 
 
+@app.get("/status", response_model=StatusResponse)
+async def service_status():
+    return StatusResponse(**scheduler.status(), coalescing=coalescer.status())
+
+
 @app.post("/detect-faces", response_model=DetectFacesResponse)
 async def detect_faces(request: DetectFacesRequest):
+    recorder.record(
+        "/detect-faces", request.image_base64, request.camera_id, request.priority
+    )
     try:
-        image = face_processor.decode_image(request.image_base64)
-        faces = face_processor.detect_faces(image)
+        def run():
+            image, transform = face_processor.decode_frame(
+                request.image_base64, request.camera_id
+            )
+            return face_processor.detect_faces(image, transform)
+
+        faces = await coalescer.run(
+            (
+                "detect-faces",
+                request.priority,
+                request.camera_id,
+                image_key(request.image_base64),
+            ),
+            lambda: scheduler.submit(request.priority, run, request.camera_id),
+        )
 
         return DetectFacesResponse(
             faces=[
@@ -85,9 +117,22 @@ async def detect_faces(request: DetectFacesRequest):
 
 @app.post("/generate-embedding", response_model=GenerateEmbeddingResponse)
 async def generate_embedding(request: GenerateEmbeddingRequest):
+    recorder.record(
+        "/generate-embedding", request.face_image_base64, priority=request.priority
+    )
     try:
-        image = face_processor.decode_image(request.face_image_base64)
-        embedding = face_processor.generate_embedding(image)
+        def run():
+            image = face_processor.decode_image(request.face_image_base64)
+            return face_processor.generate_embedding(image)
+
+        embedding = await coalescer.run(
+            (
+                "generate-embedding",
+                request.priority,
+                image_key(request.face_image_base64),
+            ),
+            lambda: scheduler.submit(request.priority, run),
+        )
 
         if embedding is None:
             raise HTTPException(
@@ -112,9 +157,27 @@ async def generate_embedding(request: GenerateEmbeddingRequest):
 @app.post("/detect-and-embed", response_model=DetectAndEmbedResponse)
 async def detect_and_embed(request: DetectAndEmbedRequest):
     """Combined detect + embed in one call. Runs model.get() once instead of twice."""
+    recorder.record(
+        "/detect-and-embed", request.image_base64, request.camera_id, request.priority
+    )
     try:
-        image = face_processor.decode_image(request.image_base64)
-        faces = face_processor.detect_and_embed(image)
+        def run():
+            image, transform = face_processor.decode_frame(
+                request.image_base64,
+                request.camera_id,
+                max_reduction=settings.embed_max_decode_reduction,
+            )
+            return face_processor.detect_and_embed(image, transform)
+
+        faces = await coalescer.run(
+            (
+                "detect-and-embed",
+                request.priority,
+                request.camera_id,
+                image_key(request.image_base64),
+            ),
+            lambda: scheduler.submit(request.priority, run, request.camera_id),
+        )
 
         return DetectAndEmbedResponse(
             faces=[
@@ -161,6 +224,40 @@ async def match_embedding(request: MatchRequest):
         raise HTTPException(status_code=500, detail="Face matching failed")
 
 
+@app.post("/compact-templates", response_model=CompactTemplatesResponse)
+async def compact_templates(request: CompactTemplatesRequest):
+    """Shrink each customer's embeddings to a few templates for the match gallery."""
+    try:
+        candidates = [
+            {
+                "customer_id": c.customer_id,
+                "embedding": c.embedding,
+                "quality": c.quality,
+            }
+            for c in request.candidate_embeddings
+        ]
+        check_gallery_size(candidates)
+
+        result = await scheduler.submit(
+            request.priority,
+            lambda: compact_gallery(
+                candidates,
+                max_templates=request.max_templates,
+                method=request.method,
+                threshold=request.threshold,
+            ),
+        )
+
+        return CompactTemplatesResponse(**result)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except RuntimeError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    except Exception as e:
+        logger.error(f"Template compaction error: {e}")
+        raise HTTPException(status_code=500, detail="Template compaction failed")
+
+
 if __name__ == "__main__":
     import uvicorn
 
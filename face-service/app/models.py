@@ -1,9 +1,15 @@
 from pydantic import BaseModel, Field
-from typing import Optional
+from typing import Literal, Optional
+
+Priority = Literal["live", "interactive", "batch"]
 
 
 class DetectFacesRequest(BaseModel):
     image_base64: str = Field(..., description="Base64 encoded image")
+    camera_id: Optional[str] = Field(
+        None, description="Camera the frame came from (selects its ROI)"
+    )
+    priority: Priority = Field("live", description="Scheduler lane")
 
 
 class BoundingBox(BaseModel):
@@ -26,6 +32,9 @@ class DetectFacesResponse(BaseModel):
 
 class GenerateEmbeddingRequest(BaseModel):
     face_image_base64: str = Field(..., description="Base64 encoded face image")
+    priority: Priority = Field(
+        "interactive", description="Scheduler lane (use batch for imports)"
+    )
 
 
 class GenerateEmbeddingResponse(BaseModel):
@@ -36,6 +45,9 @@ class GenerateEmbeddingResponse(BaseModel):
 class CandidateEmbedding(BaseModel):
     customer_id: str
     embedding: list[float]
+    quality: Optional[float] = Field(
+        None, description="Capture quality (e.g. detection score), used by compaction"
+    )
 
 
 class MatchRequest(BaseModel):
@@ -54,8 +66,54 @@ class MatchResponse(BaseModel):
     confidence: float = Field(..., description="Similarity score")
 
 
+class CompactTemplatesRequest(BaseModel):
+    candidate_embeddings: list[CandidateEmbedding] = Field(
+        ..., description="Enrolled embeddings, several per customer"
+    )
+    max_templates: int = Field(
+        default=3, ge=1, description="Templates to keep per customer"
+    )
+    method: Literal["medoids", "centroid"] = Field(
+        default="medoids",
+        description="Keep cluster medoids or quality-weighted cluster centroids",
+    )
+    threshold: float = Field(
+        default=0.75, ge=0.0, le=1.0, description="Match threshold for recall estimate"
+    )
+    priority: Priority = Field("batch", description="Scheduler lane")
+
+
+class CustomerCompaction(BaseModel):
+    customer_id: str
+    original_count: int
+    compacted_count: int
+    recall_before: Optional[float] = None
+    recall_after: Optional[float] = None
+
+
+class CompactTemplatesResponse(BaseModel):
+    templates: list[CandidateEmbedding] = Field(
+        ..., description="Compacted gallery, usable as /match candidates"
+    )
+    customers: list[CustomerCompaction]
+    original_count: int
+    compacted_count: int
+    probes_evaluated: int = Field(
+        ..., description="Held-out embeddings used for the recall estimate"
+    )
+    recall_before: Optional[float] = None
+    recall_after: Optional[float] = None
+    recall_change: Optional[float] = Field(
+        None, description="Expected recall change (after - before)"
+    )
+
+
 class DetectAndEmbedRequest(BaseModel):
     image_base64: str = Field(..., description="Base64 encoded image")
+    camera_id: Optional[str] = Field(
+        None, description="Camera the frame came from (selects its ROI)"
+    )
+    priority: Priority = Field("live", description="Scheduler lane")
 
 
 class FaceWithEmbedding(BaseModel):
@@ -74,3 +132,32 @@ class HealthResponse(BaseModel):
     status: str
     model_loaded: bool
     model_version: str
+
+
+class LaneStatus(BaseModel):
+    name: str
+    concurrency: int = Field(..., description="Max jobs running in this lane")
+    queued: int
+    running: int
+    completed: int = Field(..., description="Jobs that finished successfully")
+    failed: int = Field(..., description="Jobs that raised or were cancelled")
+    dropped: int = Field(..., description="Live frames dropped past deadline")
+    rejected: int = Field(..., description="Requests rejected on a full queue")
+    cameras_waiting: int
+
+
+class CoalescingStatus(BaseModel):
+    enabled: bool
+    in_flight: int = Field(..., description="Distinct requests being processed")
+    leaders: int = Field(..., description="Requests that ran inference")
+    coalesced: int = Field(..., description="Requests served by an in-flight twin")
+
+
+class StatusResponse(BaseModel):
+    workers: int
+    live_reserved_workers: int = Field(
+        ..., description="Workers kept free for live frames"
+    )
+    running: int
+    lanes: list[LaneStatus]
+    coalescing: CoalescingStatus
@@ -0,0 +1,289 @@
+"""
+Replay a face service capture log as load.
+
+Plays requests recorded with FACE_CAPTURE_PATH back against the service,
+either in-process through the ASGI app or over HTTP, and reports latency,
+throughput and drop rate. Requests are sent open-loop: each one goes out at
+its scheduled time whether or not earlier ones have completed.
+
+Usage:
+    python -m app.replay capture.bin                         # original timing, in-process
+    python -m app.replay capture.bin --speed 4               # 4x original speed
+    python -m app.replay capture.bin --rps 50 --cameras 20 --duration 60
+    python -m app.replay capture.bin --url http://localhost:8000
+    python -m app.replay capture.bin --max-gap 0             # keep idle gaps as recorded
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import Optional
+
+import httpx
+
+from .capture import CapturedRequest, read_capture
+
+# Request body field carrying the image, per endpoint
+PAYLOAD_FIELDS = {
+    "/detect-faces": "image_base64",
+    "/detect-and-embed": "image_base64",
+    "/generate-embedding": "face_image_base64",
+}
+
+
+@dataclass
+class ReplayResult:
+    status: Optional[int]  # None on timeout, -1 on connection error
+    latency: float
+
+
+def build_schedule(
+    records: list[CapturedRequest],
+    speed: float = 1.0,
+    rps: Optional[float] = None,
+    duration: Optional[float] = None,
+    cameras: Optional[int] = None,
+    max_gap: Optional[float] = 5.0,
+) -> list[tuple[float, CapturedRequest, Optional[str]]]:
+    """Return (send offset in seconds, record, camera id) for every request.
+
+    With ``rps`` the records are cycled at a fixed rate for ``duration``
+    seconds; otherwise the recorded inter-arrival times are divided by
+    ``speed`` and ``duration``, if given, cuts the replay off at that offset. Recorded gaps longer than ``max_gap`` seconds (idle periods,
+    service restarts between appended sessions) are collapsed to ``max_gap``.
+    ``cameras`` spreads requests over that many simulated cameras.
+    """
+    if rps:
+        count = int(rps * duration) if duration else len(records)
+        picked = [(i / rps, records[i % len(records)]) for i in range(count)]
+    else:
+        picked = []
+        offset = 0.0
+        previous = records[0].timestamp
+        for r in records:
+            gap = max(r.timestamp - previous, 0.0)
+            if max_gap is not None:
+                gap = min(gap, max_gap)
+            offset += gap / speed
+            previous = r.timestamp
+            if duration is not None and offset > duration:
+                break
+            picked.append((offset, r))
+
+    return [
+        (offset, record, f"sim-cam-{i % cameras:03d}" if cameras else record.camera_id)
+        for i, (offset, record) in enumerate(picked)
+    ]
+
+
+async def _send(
+    client: httpx.AsyncClient,
+    record: CapturedRequest,
+    image_base64: str,
+    camera_id: Optional[str],
+    timeout: float,
+) -> ReplayResult:
+    payload = {
+        PAYLOAD_FIELDS[record.endpoint]: image_base64,
+        "priority": record.priority,
+    }
+    if record.endpoint != "/generate-embedding":
+        payload["camera_id"] = camera_id
+
+    started = time.perf_counter()
+    try:
+        # wait_for as well: ASGITransport ignores the client timeout in-process
+        response = await asyncio.wait_for(
+            client.post(record.endpoint, json=payload, timeout=timeout), timeout
+        )
+        status = response.status_code
+    except (asyncio.TimeoutError, httpx.TimeoutException):
+        status = None
+    except httpx.HTTPError:
+        status = -1
+    return ReplayResult(status=status, latency=time.perf_counter() - started)
+
+
+async def replay(
+    client: httpx.AsyncClient,
+    schedule: list[tuple[float, CapturedRequest, Optional[str]]],
+    timeout: float = 10.0,
+) -> tuple[list[ReplayResult], float]:
+    """Send every scheduled request on time; returns results and elapsed seconds."""
+    # Encode once up front so base64 work does not skew send times
+    encoded = {id(r): r.image_base64 for _, r, _ in schedule}
+
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    tasks = []
+    for offset, record, camera_id in schedule:
+        delay = start + offset - loop.time()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        tasks.append(
+            asyncio.create_task(
+                _send(client, record, encoded[id(record)], camera_id, timeout)
+            )
+        )
+
+    results = await asyncio.gather(*tasks)
+    return results, loop.time() - start
+
+
+def _percentile(sorted_values: list[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = int(round(pct / 100 * (len(sorted_values) - 1)))
+    return sorted_values[min(index, len(sorted_values) - 1)]
+
+
+async def coalesced_count(client: httpx.AsyncClient) -> Optional[int]:
+    """Requests the service answered from an in-flight twin (GET /status)."""
+    try:
+        response = await client.get("/status", timeout=5.0)
+        response.raise_for_status()
+        return response.json()["coalescing"]["coalesced"]
+    except (httpx.HTTPError, KeyError, ValueError):
+        return None
+
+
+def summarize(
+    results: list[ReplayResult], elapsed: float, coalesced: Optional[int] = None
+) -> dict:
+    ok = sorted(
+        r.latency for r in results if r.status is not None and 200 <= r.status < 300
+    )
+    dropped = sum(1 for r in results if r.status == 503)
+    timeouts = sum(1 for r in results if r.status is None)
+    sent = len(results)
+
+    return {
+        "sent": sent,
+        "ok": len(ok),
+        "dropped": dropped,
+        "timeouts": timeouts,
+        "errors": sent - len(ok) - dropped - timeouts,
+        "coalesced": coalesced,
+        "elapsed_s": elapsed,
+        "offered_rps": sent / elapsed if elapsed else 0.0,
+        "throughput_rps": len(ok) / elapsed if elapsed else 0.0,
+        "drop_rate": (dropped + timeouts) / sent if sent else 0.0,
+        "latency_ms": {
+            "p50": _percentile(ok, 50) * 1000,
+            "p90": _percentile(ok, 90) * 1000,
+            "p99": _percentile(ok, 99) * 1000,
+            "max": (ok[-1] if ok else 0.0) * 1000,
+        },
+    }
+
+
+def print_report(summary: dict):
+    latency = summary["latency_ms"]
+    print(f"  Sent:        {summary['sent']} in {summary['elapsed_s']:.1f}s "
+          f"({summary['offered_rps']:.1f} req/s offered)")
+    print(f"  OK:          {summary['ok']} ({summary['throughput_rps']:.1f} req/s)")
+    print(f"  Dropped:     {summary['dropped']} (503)")
+    print(f"  Timeouts:    {summary['timeouts']}")
+    print(f"  Errors:      {summary['errors']}")
+    if summary["coalesced"] is None:
+        print("  Coalesced:   unknown (GET /status unavailable)")
+    else:
+        print(f"  Coalesced:   {summary['coalesced']} (served without own inference)")
+    print(f"  Drop rate:   {summary['drop_rate']:.1%}")
+    print(f"  Latency ms:  p50={latency['p50']:.0f} p90={latency['p90']:.0f} "
+          f"p99={latency['p99']:.0f} max={latency['max']:.0f}")
+
+
+@asynccontextmanager
+async def _client(url: Optional[str]):
+    limits = httpx.Limits(max_connections=None, max_keepalive_connections=100)
+    if url:
+        async with httpx.AsyncClient(base_url=url, limits=limits) as client:
+            yield client
+        return
+
+    from .config import settings
+    from .main import app
+
+    # Never record the replay into a capture log, and run inference for every
+    # request: cycled captures repeat frames that coalescing would merge
+    settings.capture_path = None
+    settings.coalesce_requests = False
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://face-service", limits=limits
+        ) as client:
+            yield client
+
+
+async def _main(args) -> int:
+    records = list(read_capture(args.capture))
+    if args.endpoint:
+        records = [r for r in records if r.endpoint == args.endpoint]
+    if not records:
+        print("No requests in capture")
+        return 1
+
+    schedule = build_schedule(
+        records,
+        speed=args.speed,
+        rps=args.rps,
+        duration=args.duration,
+        cameras=args.cameras,
+        max_gap=args.max_gap if args.max_gap > 0 else None,
+    )
+    target = args.url or "in-process ASGI app"
+    print(f"Replaying {len(schedule)} requests from {args.capture} against {target}")
+
+    async with _client(args.url) as client:
+        before = await coalesced_count(client)
+        results, elapsed = await replay(client, schedule, timeout=args.timeout)
+        after = await coalesced_count(client)
+
+    coalesced = after - before if before is not None and after is not None else None
+    print_report(summarize(results, elapsed, coalesced))
+    return 0
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("capture", help="Capture log written via FACE_CAPTURE_PATH")
+    parser.add_argument("--url", help="Replay over HTTP (default: in-process ASGI app)")
+    parser.add_argument("--speed", type=float, default=1.0,
+                        help="Multiple of recorded speed (default 1.0)")
+    parser.add_argument("--rps", type=float,
+                        help="Open-loop target rate instead of recorded timing")
+    parser.add_argument("--duration", type=float,
+                        help="Seconds to run: with --rps, how long to cycle the log; "
+                             "otherwise a cutoff (default: one pass over the log)")
+    parser.add_argument("--cameras", type=int,
+                        help="Spread requests over this many simulated cameras")
+    parser.add_argument("--max-gap", type=float, default=5.0,
+                        help="Collapse recorded gaps longer than this many seconds "
+                             "(default 5, 0 keeps them)")
+    parser.add_argument("--endpoint", choices=sorted(PAYLOAD_FIELDS),
+                        help="Only replay requests to this endpoint")
+    parser.add_argument("--timeout", type=float, default=10.0,
+                        help="Per-request timeout in seconds (default 10)")
+    args = parser.parse_args(argv)
+
+    if args.speed <= 0:
+        parser.error("--speed must be positive")
+    if args.rps is not None and args.rps <= 0:
+        parser.error("--rps must be positive")
+    if args.cameras is not None and args.cameras <= 0:
+        parser.error("--cameras must be positive")
+    if args.duration is not None and args.duration <= 0:
+        parser.error("--duration must be positive")
+    if args.timeout <= 0:
+        parser.error("--timeout must be positive")
+
+    return asyncio.run(_main(args))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
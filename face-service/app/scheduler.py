@@ -0,0 +1,231 @@
+import asyncio
+import logging
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Optional
+
+from .config import settings
+
+logger = logging.getLogger(__name__)
+
+# Highest priority first
+LANES = ("live", "interactive", "batch")
+
+
+class FrameExpiredError(RuntimeError):
+    """A live frame waited past its deadline and was dropped unprocessed."""
+
+
+class SchedulerOverloadedError(RuntimeError):
+    """The lane queue is full; the request was rejected without queueing."""
+
+
+@dataclass
+class _Job:
+    fn: Callable[[], Any]
+    future: asyncio.Future
+    camera_id: str
+    deadline: Optional[float]
+    timer: Optional[asyncio.TimerHandle] = None
+    queued: bool = True
+
+
+@dataclass
+class _Lane:
+    name: str
+    concurrency: int
+    deadline: Optional[float]
+    # camera_id -> pending jobs; round-robin over cameras for fairness
+    queues: "OrderedDict[str, deque[_Job]]" = field(default_factory=OrderedDict)
+    queued: int = 0
+    running: int = 0
+    completed: int = 0
+    failed: int = 0
+    dropped: int = 0
+    rejected: int = 0
+
+    def push(self, job: _Job) -> None:
+        self.queues.setdefault(job.camera_id, deque()).append(job)
+        self.queued += 1
+
+    def pop(self) -> Optional[_Job]:
+        if not self.queues:
+            return None
+        camera_id, queue = next(iter(self.queues.items()))
+        job = queue.popleft()
+        job.queued = False
+        self.queued -= 1
+        if queue:
+            self.queues.move_to_end(camera_id)
+        else:
+            del self.queues[camera_id]
+        return job
+
+    def remove(self, job: _Job) -> None:
+        queue = self.queues[job.camera_id]
+        queue.remove(job)
+        job.queued = False
+        self.queued -= 1
+        if not queue:
+            del self.queues[job.camera_id]
+
+
+class RequestScheduler:
+    """Runs blocking inference off the event loop with priority lanes.
+
+    Lanes are served strictly in priority order, each capped at its own
+    concurrency. Non-live jobs may occupy at most scheduler_workers -
+    live_reserved_workers workers (running live jobs do not count against
+    that budget), so enrollment and batch work can never hold every worker.
+    Within a lane, cameras are served round-robin. Live jobs carry a deadline
+    and are dropped, failing their caller, as soon as it passes while queued.
+    """
+
+    def __init__(self):
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._running = 0
+        self._lanes = {
+            "live": _Lane(
+                "live",
+                settings.live_lane_concurrency,
+                settings.live_deadline_ms / 1000,
+            ),
+            "interactive": _Lane(
+                "interactive", settings.interactive_lane_concurrency, None
+            ),
+            "batch": _Lane("batch", settings.batch_lane_concurrency, None),
+        }
+
+    def start(self):
+        if settings.live_reserved_workers >= settings.scheduler_workers:
+            raise ValueError(
+                "live_reserved_workers must be lower than scheduler_workers"
+            )
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=settings.scheduler_workers,
+                thread_name_prefix="face-worker",
+            )
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    async def submit(
+        self,
+        lane: str,
+        fn: Callable[[], Any],
+        camera_id: Optional[str] = None,
+    ) -> Any:
+        if lane not in self._lanes:
+            raise ValueError(f"Unknown priority lane: {lane}")
+        self.start()
+
+        target = self._lanes[lane]
+        if target.queued >= settings.lane_queue_limit:
+            target.rejected += 1
+            raise SchedulerOverloadedError(f"{lane} queue is full")
+
+        loop = asyncio.get_running_loop()
+        job = _Job(
+            fn=fn,
+            future=loop.create_future(),
+            camera_id=camera_id or "",
+            deadline=(
+                loop.time() + target.deadline if target.deadline is not None else None
+            ),
+        )
+        target.push(job)
+        if job.deadline is not None:
+            job.timer = loop.call_at(job.deadline, self._expire, target, job)
+        # Caller went away (disconnect or cancellation) while queued
+        job.future.add_done_callback(lambda _: self._discard(target, job))
+        self._dispatch()
+        return await job.future
+
+    def _expire(self, lane: _Lane, job: _Job):
+        if not job.queued or job.future.done():
+            return
+        lane.remove(job)
+        lane.dropped += 1
+        job.future.set_exception(FrameExpiredError("Frame expired before processing"))
+
+    def _discard(self, lane: _Lane, job: _Job):
+        if job.timer is not None:
+            job.timer.cancel()
+        if job.queued:
+            lane.remove(job)
+
+    def _non_live_running(self) -> int:
+        return self._running - self._lanes["live"].running
+
+    def _next(self) -> Optional[tuple[_Lane, _Job]]:
+        non_live_slots = settings.scheduler_workers - settings.live_reserved_workers
+        for name in LANES:
+            lane = self._lanes[name]
+            if name != "live" and self._non_live_running() >= non_live_slots:
+                continue
+            while lane.running < lane.concurrency and lane.queued:
+                job = lane.pop()
+                if job.timer is not None:
+                    job.timer.cancel()
+                if job.future.done():
+                    continue
+                return lane, job
+        return None
+
+    def _dispatch(self):
+        loop = asyncio.get_running_loop()
+        while self._running < settings.scheduler_workers:
+            picked = self._next()
+            if picked is None:
+                return
+            lane, job = picked
+            self._running += 1
+            lane.running += 1
+            task = loop.run_in_executor(self._executor, job.fn)
+            task.add_done_callback(
+                lambda t, lane=lane, job=job: self._finish(lane, job, t)
+            )
+
+    def _finish(self, lane: _Lane, job: _Job, task: asyncio.Future):
+        self._running -= 1
+        lane.running -= 1
+        if task.cancelled() or task.exception() is not None:
+            lane.failed += 1
+        else:
+            lane.completed += 1
+        if not job.future.done():
+            if task.cancelled():
+                job.future.cancel()
+            elif task.exception() is not None:
+                job.future.set_exception(task.exception())
+            else:
+                job.future.set_result(task.result())
+        self._dispatch()
+
+    def status(self) -> dict:
+        return {
+            "workers": settings.scheduler_workers,
+            "live_reserved_workers": settings.live_reserved_workers,
+            "running": self._running,
+            "lanes": [
+                {
+                    "name": lane.name,
+                    "concurrency": lane.concurrency,
+                    "queued": lane.queued,
+                    "running": lane.running,
+                    "completed": lane.completed,
+                    "failed": lane.failed,
+                    "dropped": lane.dropped,
+                    "rejected": lane.rejected,
+                    "cameras_waiting": len(lane.queues),
+                }
+                for lane in (self._lanes[name] for name in LANES)
+            ],
+        }
+
+
+scheduler = RequestScheduler()
@@ -0,0 +1,243 @@
+import logging
+from collections import OrderedDict
+from typing import Optional
+
+import numpy as np
+
+from .config import settings
+
+logger = logging.getLogger(__name__)
+
+
+def _normalize(matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+# Cosine distance below which two embeddings count as the same capture
+_DUPLICATE_DISTANCE = 1e-6
+
+
+def _deduplicate(
+    vectors: np.ndarray, weights: np.ndarray
+) -> tuple[np.ndarray, np.ndarray]:
+    """Merge identical embeddings (e.g. the same photo enrolled twice), summing weights."""
+    if len(vectors) == 0:
+        return vectors, weights
+
+    duplicate = (1.0 - vectors @ vectors.T) <= _DUPLICATE_DISTANCE
+    # Each vector maps to the first vector it duplicates (itself if none);
+    # follow the chain so every representative is one that is kept
+    representative = np.argmax(duplicate, axis=1)
+    while True:
+        chained = representative[representative]
+        if np.array_equal(chained, representative):
+            break
+        representative = chained
+
+    merged = np.zeros(len(vectors), dtype=np.float32)
+    np.add.at(merged, representative, weights)
+    kept = np.flatnonzero(representative == np.arange(len(vectors)))
+    return vectors[kept], merged[kept]
+
+
+def _cluster(
+    vectors: np.ndarray, weights: np.ndarray, k: int, max_iter: int = 10
+) -> tuple[list[int], np.ndarray]:
+    """Weighted k-medoids on cosine distance. Returns medoid indices and labels.
+
+    Returns fewer than ``k`` medoids when there are not that many distinct
+    vectors; medoids are always distinct.
+    """
+    dist = 1.0 - vectors @ vectors.T
+
+    # Farthest-first seeding from the overall weighted medoid
+    medoids = [int(np.argmin(dist @ weights))]
+    while len(medoids) < k:
+        nearest = dist[:, medoids].min(axis=1)
+        farthest = int(np.argmax(nearest))
+        if nearest[farthest] <= _DUPLICATE_DISTANCE:
+            break
+        medoids.append(farthest)
+
+    for _ in range(max_iter):
+        labels = np.argmin(dist[:, medoids], axis=1)
+        updated = []
+        for c, medoid in enumerate(medoids):
+            members = np.flatnonzero(labels == c)
+            if members.size == 0:
+                updated.append(medoid)
+                continue
+            cost = dist[np.ix_(members, members)] @ weights[members]
+            updated.append(int(members[np.argmin(cost)]))
+        updated = list(dict.fromkeys(updated))
+        if updated == medoids:
+            break
+        medoids = updated
+
+    return medoids, np.argmin(dist[:, medoids], axis=1)
+
+
+def compact_embeddings(
+    embeddings: np.ndarray,
+    qualities: Optional[np.ndarray] = None,
+    max_templates: int = 3,
+    method: str = "medoids",
+) -> np.ndarray:
+    """Reduce one customer's embeddings to at most ``max_templates`` templates.
+
+    Embeddings are clustered with quality-weighted k-medoids. ``medoids`` keeps
+    the most central real embedding of each cluster; ``centroid`` keeps the
+    quality-weighted mean of each cluster instead. Returns unit-norm rows.
+    """
+    vectors = np.asarray(embeddings, dtype=np.float32)
+    weights = (
+        np.ones(len(vectors), dtype=np.float32)
+        if qualities is None
+        else np.clip(np.asarray(qualities, dtype=np.float32), 1e-3, None)
+    )
+
+    # Zero vectors can never match and must not reach the gallery
+    nonzero = np.linalg.norm(vectors, axis=1) > 0
+    vectors, weights = _deduplicate(_normalize(vectors[nonzero]), weights[nonzero])
+
+    if len(vectors) <= max_templates:
+        return vectors
+
+    medoids, labels = _cluster(vectors, weights, max_templates)
+
+    if method == "medoids":
+        return vectors[medoids]
+
+    clusters = [labels == c for c in range(len(medoids)) if np.any(labels == c)]
+    centroids = np.stack(
+        [(vectors[members] * weights[members, None]).sum(axis=0) for members in clusters]
+    )
+    centroids = centroids[np.linalg.norm(centroids, axis=1) > 0]
+    return _normalize(centroids)
+
+
+def _best_similarity(probe: np.ndarray, templates: np.ndarray) -> float:
+    if len(templates) == 0:
+        return 0.0
+    # Same [0, 1] scale as FaceProcessor.find_best_match
+    return float((np.max(templates @ probe) + 1) / 2)
+
+
+def leave_one_out_recall(
+    embeddings: np.ndarray,
+    qualities: Optional[np.ndarray],
+    max_templates: int,
+    method: str,
+    threshold: float,
+) -> tuple[int, int, int]:
+    """Hold out embeddings as probes and match each against the rest.
+
+    Returns (probes, hits against the full set, hits against the compacted set),
+    so the recall change reflects unseen captures rather than self-matches.
+    Each probe re-runs compaction, so at most ``settings.compaction_max_probes``
+    evenly spaced probes are evaluated per customer.
+    """
+    vectors = _normalize(np.asarray(embeddings, dtype=np.float32))
+    n = len(vectors)
+    if n < 2:
+        return 0, 0, 0
+
+    probes = np.unique(
+        np.linspace(0, n - 1, min(n, settings.compaction_max_probes)).astype(int)
+    )
+    hits_full = 0
+    hits_compact = 0
+    for i in probes:
+        rest = np.delete(vectors, i, axis=0)
+        rest_q = None if qualities is None else np.delete(qualities, i)
+        compact = compact_embeddings(rest, rest_q, max_templates, method)
+        if _best_similarity(vectors[i], rest) >= threshold:
+            hits_full += 1
+        if _best_similarity(vectors[i], compact) >= threshold:
+            hits_compact += 1
+
+    return len(probes), hits_full, hits_compact
+
+
+def check_gallery_size(candidates: list[dict]):
+    """Reject galleries whose per-customer size would make compaction too slow."""
+    counts: dict[str, int] = {}
+    for c in candidates:
+        counts[c["customer_id"]] = counts.get(c["customer_id"], 0) + 1
+    limit = settings.compaction_max_embeddings_per_customer
+    over = [customer_id for customer_id, count in counts.items() if count > limit]
+    if over:
+        raise ValueError(
+            f"{len(over)} customer(s) exceed {limit} embeddings "
+            f"(e.g. {over[0]}); split or pre-filter them"
+        )
+
+
+def compact_gallery(
+    candidates: list[dict],
+    max_templates: int = 3,
+    method: str = "medoids",
+    threshold: float = 0.75,
+) -> dict:
+    """Compact every customer's embeddings in a match gallery.
+
+    ``candidates`` uses the same shape as FaceProcessor.find_best_match, with
+    an optional ``quality`` (e.g. detection score) per embedding.
+    """
+    grouped: "OrderedDict[str, list[dict]]" = OrderedDict()
+    for c in candidates:
+        grouped.setdefault(c["customer_id"], []).append(c)
+
+    templates = []
+    customers = []
+    total_probes = total_full = total_compact = 0
+
+    for customer_id, entries in grouped.items():
+        embeddings = np.array([e["embedding"] for e in entries], dtype=np.float32)
+        qualities = None
+        if any(e.get("quality") is not None for e in entries):
+            qualities = np.array(
+                [1.0 if e.get("quality") is None else e["quality"] for e in entries],
+                dtype=np.float32,
+            )
+
+        compact = compact_embeddings(embeddings, qualities, max_templates, method)
+        probes, hits_full, hits_compact = leave_one_out_recall(
+            embeddings, qualities, max_templates, method, threshold
+        )
+        total_probes += probes
+        total_full += hits_full
+        total_compact += hits_compact
+
+        templates.extend(
+            {"customer_id": customer_id, "embedding": row.tolist()} for row in compact
+        )
+        customers.append(
+            {
+                "customer_id": customer_id,
+                "original_count": len(entries),
+                "compacted_count": len(compact),
+                "recall_before": hits_full / probes if probes else None,
+                "recall_after": hits_compact / probes if probes else None,
+            }
+        )
+
+    recall_before = total_full / total_probes if total_probes else None
+    recall_after = total_compact / total_probes if total_probes else None
+    logger.info(
+        f"Compacted gallery: {len(candidates)} -> {len(templates)} templates "
+        f"for {len(grouped)} customers"
+    )
+
+    return {
+        "templates": templates,
+        "customers": customers,
+        "original_count": len(candidates),
+        "compacted_count": len(templates),
+        "probes_evaluated": total_probes,
+        "recall_before": recall_before,
+        "recall_after": recall_after,
+        "recall_change": recall_after - recall_before if total_probes else None,
+    }
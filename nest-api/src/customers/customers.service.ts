@@ -52,7 +52,7 @@ export class CustomersService {
 
     const imageBase64 = profileImage.buffer.toString('base64');
 
-    const faces = await this.faceServiceClient.detectFaces(imageBase64);
+    const faces = await this.faceServiceClient.detectFaces(imageBase64, 'interactive');
     if (faces.length === 0) {
       throw new BadRequestException('No face detected in the provided image');
     }
@@ -60,7 +60,7 @@ export class CustomersService {
       throw new BadRequestException('Multiple faces detected. Please provide an image with a single face');
     }
 
-    const embeddingResult = await this.faceServiceClient.generateEmbedding(imageBase64);
+    const embeddingResult = await this.faceServiceClient.generateEmbedding(imageBase64, 'interactive');
 
     const filename = `${Date.now()}-${Math.random().toString(36).substring(7)}.jpg`;
     const filePath = path.join(this.profileImagesPath, filename);
@@ -193,7 +193,7 @@ export class CustomersService {
 
     const imageBase64 = profileImage.buffer.toString('base64');
 
-    const faces = await this.faceServiceClient.detectFaces(imageBase64);
+    const faces = await this.faceServiceClient.detectFaces(imageBase64, 'interactive');
     if (faces.length === 0) {
       throw new BadRequestException('No face detected in the provided image');
     }
@@ -201,7 +201,7 @@ export class CustomersService {
       throw new BadRequestException('Multiple faces detected. Please provide an image with a single face');
     }
 
-    const embeddingResult = await this.faceServiceClient.generateEmbedding(imageBase64);
+    const embeddingResult = await this.faceServiceClient.generateEmbedding(imageBase64, 'interactive');
 
     if (customer.profileImageUrl) {
       const oldPath = path.join(process.cwd(), customer.profileImageUrl);
@@ -23,6 +23,9 @@ export interface MatchResult {
   confidence: number;
 }
 
+/** Face service scheduler lane; live frames are served first and may be dropped. */
+export type FacePriority = 'live' | 'interactive' | 'batch';
+
 export interface FaceWithEmbedding {
   bbox: number[];
   confidence: number;
@@ -62,10 +65,11 @@ export class FaceServiceClient {
     this.timeout = this.configService.get<number>('faceService.timeout') || 5000;
   }
 
-  async detectFaces(imageBase64: string): Promise<DetectedFace[]> {
+  async detectFaces(imageBase64: string, priority: FacePriority = 'live'): Promise<DetectedFace[]> {
     try {
       const response = await this.post<DetectFacesResponse>('/detect-faces', {
         image_base64: imageBase64,
+        priority,
       });
       return response.faces || [];
     } catch (error) {
@@ -77,10 +81,14 @@ export class FaceServiceClient {
     }
   }
 
-  async generateEmbedding(faceImageBase64: string): Promise<EmbeddingResult> {
+  async generateEmbedding(
+    faceImageBase64: string,
+    priority: FacePriority = 'interactive',
+  ): Promise<EmbeddingResult> {
     try {
       const response = await this.post<GenerateEmbeddingResponse>('/generate-embedding', {
         face_image_base64: faceImageBase64,
+        priority,
       });
       return {
         embedding: response.embedding,
@@ -95,10 +103,11 @@ export class FaceServiceClient {
     }
   }
 
-  async detectAndEmbed(imageBase64: string): Promise<FaceWithEmbedding[]> {
+  async detectAndEmbed(imageBase64: string, cameraId?: string): Promise<FaceWithEmbedding[]> {
     try {
       const response = await this.post<DetectAndEmbedResponse>('/detect-and-embed', {
         image_base64: imageBase64,
+        camera_id: cameraId,
       });
       return response.faces || [];
     } catch (error) {
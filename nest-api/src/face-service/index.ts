@@ -1,2 +1,2 @@
 export { FaceServiceModule } from './face-service.module';
-export { FaceServiceClient, CandidateEmbedding, MatchResult, EmbeddingResult, DetectedFace } from './face-service.client';
+export { FaceServiceClient, CandidateEmbedding, MatchResult, EmbeddingResult, DetectedFace, FacePriority } from './face-service.client';
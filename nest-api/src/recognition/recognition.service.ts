@@ -122,7 +122,7 @@ export class RecognitionService implements OnModuleInit {
     }
 
     // Single call: detect faces + extract embeddings in one model.get() pass
-    const faces = await this.faceServiceClient.detectAndEmbed(imageBase64);
+    const faces = await this.faceServiceClient.detectAndEmbed(imageBase64, cameraId);
 
     if (faces.length === 0) {
       return { facesDetected: 0, results: [] };